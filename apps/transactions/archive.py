@@ -0,0 +1,309 @@
+import gzip
+import hashlib
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ArchivedCustomerTotals, ReviewQueueItem, SalesTransaction
+from .profiles import aggregate_by_customer, invalidate_customer_profiles
+
+ARCHIVE_FIELDS = ["id", "transaction_id", "amount", "date", "customer_id", "high_risk", "created_at"]
+
+STATUS_WRITTEN = "written"
+STATUS_VERIFIED = "verified"
+STATUS_PURGED = "purged"
+
+
+class ArchiveVerificationError(Exception):
+    """El archivo generado no coincide con las filas de `sales_transactions`."""
+
+
+def get_archive_dir():
+    return Path(getattr(settings, "TRANSACTIONS_ARCHIVE_DIR", "archive"))
+
+
+def _serialize_row(row):
+    record = dict(zip(ARCHIVE_FIELDS, row))
+    record["amount"] = str(record["amount"])
+    record["date"] = record["date"].isoformat()
+    record["created_at"] = record["created_at"].isoformat()
+    return (json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+def _deserialize_row(line):
+    record = json.loads(line)
+    record["amount"] = Decimal(record["amount"])
+    record["date"] = date.fromisoformat(record["date"])
+    record["created_at"] = datetime.fromisoformat(record["created_at"])
+    return record
+
+
+class ArchivePart:
+    """Un archivo NDJSON comprimido de un mes, con su manifiesto JSON."""
+
+    def __init__(self, data_path):
+        self.data_path = Path(data_path)
+        self.manifest_path = self.data_path.with_name(
+            self.data_path.name.replace(".ndjson.gz", ".manifest.json")
+        )
+
+    @property
+    def month(self):
+        return self.data_path.parent.name
+
+    def read_manifest(self):
+        return json.loads(self.manifest_path.read_text())
+
+    def write_manifest(self, manifest):
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(self.manifest_path)
+
+    def set_status(self, status):
+        manifest = self.read_manifest()
+        manifest["status"] = status
+        self.write_manifest(manifest)
+
+    def iter_lines(self):
+        with gzip.open(self.data_path, "rb") as fh:
+            yield from fh
+
+    def iter_batches(self, batch_size):
+        batch = []
+        for line in self.iter_lines():
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def remove(self):
+        self.data_path.unlink(missing_ok=True)
+        self.manifest_path.unlink(missing_ok=True)
+
+
+class _PartWriter:
+    def __init__(self, part):
+        self.part = part
+        self.part.data_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fh = gzip.open(self.part.data_path, "wb")
+        self.sha = hashlib.sha256()
+        self.row_count = 0
+        self.min_pk = None
+        self.max_pk = None
+
+    def write(self, pk, line):
+        self.fh.write(line)
+        self.sha.update(line)
+        self.row_count += 1
+        self.min_pk = pk if self.min_pk is None else self.min_pk
+        self.max_pk = pk
+
+    def close(self, cutoff):
+        self.fh.close()
+        self.part.write_manifest(
+            {
+                "month": self.part.month,
+                "cutoff": cutoff.isoformat(),
+                "row_count": self.row_count,
+                "sha256": self.sha.hexdigest(),
+                "min_pk": self.min_pk,
+                "max_pk": self.max_pk,
+                "status": STATUS_WRITTEN,
+            }
+        )
+        return self.part
+
+
+def iter_parts(directory=None, status=None):
+    directory = Path(directory or get_archive_dir())
+    for data_path in sorted(directory.glob("*/part-*.ndjson.gz")):
+        part = ArchivePart(data_path)
+        if not part.manifest_path.exists():
+            continue
+        if status is None or part.read_manifest()["status"] == status:
+            yield part
+
+
+def write_archive(cutoff, directory=None, chunk_size=5000):
+    """
+    Paso 1: recorre las filas con `date < cutoff` en bloques ordenados por PK y
+    las escribe en un NDJSON comprimido por mes. Devuelve las partes escritas.
+
+    Las transacciones con un ítem de revisión pendiente se quedan en la tabla hasta
+    que se decidan. Los ítems ya decididos se conservan en `review_queue`.
+    """
+    directory = Path(directory or get_archive_dir())
+    run_id = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+    writers = {}
+    queryset = (
+        SalesTransaction.objects.filter(date__lt=cutoff)
+        .exclude(review_item__decision=ReviewQueueItem.Decision.PENDING)
+        .order_by("pk")
+    )
+    last_pk = 0
+
+    try:
+        while True:
+            rows = list(queryset.filter(pk__gt=last_pk).values_list(*ARCHIVE_FIELDS)[:chunk_size])
+            if not rows:
+                break
+            for row in rows:
+                month = row[3].strftime("%Y-%m")
+                writer = writers.get(month)
+                if writer is None:
+                    part = ArchivePart(directory / month / f"part-{run_id}.ndjson.gz")
+                    writer = writers[month] = _PartWriter(part)
+                writer.write(row[0], _serialize_row(row))
+            last_pk = rows[-1][0]
+    except BaseException:
+        for writer in writers.values():
+            writer.fh.close()
+            writer.part.remove()
+        raise
+
+    return [writers[month].close(cutoff) for month in sorted(writers)]
+
+
+def verify_part(part, batch_size=1000):
+    """
+    Paso 2: comprueba que el archivo coincide con su manifiesto y que las filas
+    siguen en `sales_transactions` con el mismo contenido (conteo y sha256).
+    """
+    manifest = part.read_manifest()
+
+    file_sha = hashlib.sha256()
+    file_count = 0
+    for line in part.iter_lines():
+        file_sha.update(line)
+        file_count += 1
+
+    db_sha = hashlib.sha256()
+    db_count = 0
+    for batch in part.iter_batches(batch_size):
+        pks = [record["id"] for record in batch]
+        rows = SalesTransaction.objects.filter(pk__in=pks).order_by("pk").values_list(*ARCHIVE_FIELDS)
+        for row in rows:
+            db_sha.update(_serialize_row(row))
+            db_count += 1
+
+    expected = (manifest["row_count"], manifest["sha256"])
+    if (file_count, file_sha.hexdigest()) != expected:
+        raise ArchiveVerificationError(f"{part.data_path}: el archivo no coincide con el manifiesto.")
+    if (db_count, db_sha.hexdigest()) != expected:
+        raise ArchiveVerificationError(f"{part.data_path}: el archivo no coincide con la base de datos.")
+
+    part.set_status(STATUS_VERIFIED)
+    return manifest["row_count"]
+
+
+def _roll_up_totals(pks):
+    """
+    Suma a `archived_customer_totals` las filas que siguen en la tabla. Se calcula
+    desde la base y no desde el archivo, así que al repetir una purga las filas ya
+    eliminadas no se cuentan dos veces.
+    """
+    for row in aggregate_by_customer(SalesTransaction.objects.filter(pk__in=pks)):
+        updated = ArchivedCustomerTotals.objects.filter(customer_id=row["customer_id"]).update(
+            transaction_count=F("transaction_count") + row["transaction_count"],
+            total_amount=F("total_amount") + row["total_amount"],
+            high_risk_count=F("high_risk_count") + row["high_risk_count"],
+            last_transaction_date=Greatest("last_transaction_date", Value(row["last_transaction_date"])),
+        )
+        if not updated:
+            ArchivedCustomerTotals.objects.create(**row)
+
+
+def purge_part(part, batch_size=1000, pause_seconds=0.0):
+    """
+    Paso 3: elimina de `sales_transactions` las filas de una parte verificada, en
+    lotes pequeños (una transacción corta por lote). Cada lote suma sus totales por
+    cliente a `archived_customer_totals` en la misma transacción, de modo que los
+    perfiles no pierden la historia archivada. Es seguro repetirlo.
+    """
+    deleted = 0
+    for batch in part.iter_batches(batch_size):
+        pks = [record["id"] for record in batch]
+        with transaction.atomic():
+            _roll_up_totals(pks)
+            _, per_model = SalesTransaction.objects.filter(pk__in=pks).delete()
+        invalidate_customer_profiles(record["customer_id"] for record in batch)
+        deleted += per_model.get(SalesTransaction._meta.label, 0)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    part.set_status(STATUS_PURGED)
+    return deleted
+
+
+def resume_pending(directory=None, batch_size=1000, pause_seconds=0.0):
+    """
+    Completa una ejecución interrumpida: las partes verificadas terminan de
+    purgarse y las que solo se escribieron se descartan (sus filas siguen en la
+    tabla y se vuelven a archivar).
+    """
+    directory = Path(directory or get_archive_dir())
+    purged = 0
+    for data_path in sorted(directory.glob("*/part-*.ndjson.gz")):
+        part = ArchivePart(data_path)
+        if not part.manifest_path.exists():
+            part.remove()
+            continue
+        status = part.read_manifest()["status"]
+        if status == STATUS_VERIFIED:
+            purged += purge_part(part, batch_size, pause_seconds)
+        elif status == STATUS_WRITTEN:
+            part.remove()
+    return purged
+
+
+def remove_empty_dirs(directory=None):
+    directory = Path(directory or get_archive_dir())
+    for month_dir in directory.glob("*"):
+        if month_dir.is_dir() and not any(month_dir.iterdir()):
+            month_dir.rmdir()
+
+
+class ArchiveReader:
+    """
+    Lectura perezosa de los meses archivados, sin restaurarlos en la tabla.
+
+    Solo se leen las partes ya purgadas, de modo que ninguna fila aparece a la vez
+    en el archivo y en `sales_transactions`.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or get_archive_dir())
+
+    def months(self):
+        return sorted({part.month for part in iter_parts(self.directory, STATUS_PURGED)})
+
+    def iter_month(self, month):
+        for part in iter_parts(self.directory, STATUS_PURGED):
+            if part.month == month:
+                for line in part.iter_lines():
+                    yield _deserialize_row(line)
+
+    def query(self, customer_id=None, start=None, end=None):
+        """Itera las filas archivadas que cumplen los filtros (fechas inclusivas)."""
+        for month in self.months():
+            if start and month < start.strftime("%Y-%m"):
+                continue
+            if end and month > end.strftime("%Y-%m"):
+                continue
+            for record in self.iter_month(month):
+                if customer_id and record["customer_id"] != customer_id:
+                    continue
+                if start and record["date"] < start:
+                    continue
+                if end and record["date"] > end:
+                    continue
+                yield record
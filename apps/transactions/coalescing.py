@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import SalesTransaction
+from .ingest import after_insert_instances
+
+COMMIT_SIZE_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+class CommitSizeStats:
+    """Distribución del tamaño de los commits agrupados (filas y requests por commit)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.commits = 0
+            self.rows = 0
+            self.requests = 0
+            self.fallbacks = 0
+            self.rows_histogram = [0] * (len(COMMIT_SIZE_BUCKETS) + 1)
+
+    def record(self, rows, requests, fallback=False):
+        with self._lock:
+            self.commits += 1
+            self.rows += rows
+            self.requests += requests
+            self.fallbacks += int(fallback)
+            self.rows_histogram[bisect.bisect_left(COMMIT_SIZE_BUCKETS, rows)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<={bound}" for bound in COMMIT_SIZE_BUCKETS] + [f">{COMMIT_SIZE_BUCKETS[-1]}"]
+            return {
+                "commits": self.commits,
+                "rows": self.rows,
+                "requests": self.requests,
+                "fallbacks": self.fallbacks,
+                "avg_rows_per_commit": round(self.rows / self.commits, 2) if self.commits else 0.0,
+                "avg_requests_per_commit": round(self.requests / self.commits, 2) if self.commits else 0.0,
+                "rows_per_commit": dict(zip(labels, self.rows_histogram)),
+            }
+
+
+class _Pending:
+    __slots__ = ("instances", "event", "result", "error")
+
+    def __init__(self, instances):
+        self.instances = instances
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _insert_isolated(batches):
+    results = []
+    with transaction.atomic():
+        for batch in batches:
+            for instance in batch:
+                instance.pk = None
+            try:
+                with transaction.atomic():
+                    created = SalesTransaction.objects.bulk_create(batch)
+                    after_insert_instances(created)
+            except Exception as exc:
+                results.append(exc)
+            else:
+                results.append(created)
+    return results
+
+
+def insert_batches(batches):
+    """
+    Inserta varios lotes en un solo `bulk_create` y un solo commit.
+
+    Si el insert combinado falla, se reintenta con un savepoint por lote dentro de
+    un único commit, de modo que un lote inválido (p. ej. un `transaction_id` ya
+    existente) solo falla para su request. Devuelve, por lote, la lista de
+    instancias creadas o la excepción correspondiente, y si se usó el modo aislado.
+    """
+    try:
+        with transaction.atomic():
+            created = SalesTransaction.objects.bulk_create(
+                [instance for batch in batches for instance in batch]
+            )
+            after_insert_instances(created)
+    except Exception:
+        return _insert_isolated(batches), True
+
+    results, offset = [], 0
+    for batch in batches:
+        results.append(created[offset:offset + len(batch)])
+        offset += len(batch)
+    return results, False
+
+
+class BatchCoalescer:
+    """
+    Agrupa lotes pequeños de requests concurrentes en un único insert y commit.
+
+    El primer request que encuentra el buffer vacío actúa como líder: espera hasta
+    `max_delay_ms` o hasta reunir `max_rows` filas, y luego inserta el grupo. Los
+    demás requests esperan a que el líder publique su resultado individual.
+    """
+
+    def __init__(self, flush=insert_batches, max_delay_ms=5, max_rows=500):
+        self.flush = flush
+        self.max_delay = max_delay_ms / 1000
+        self.max_rows = max_rows
+        self.stats = CommitSizeStats()
+        self._cond = threading.Condition()
+        self._buffer = []
+        self._rows = 0
+        self._leader_active = False
+
+    def submit(self, instances):
+        pending = _Pending(instances)
+        with self._cond:
+            self._buffer.append(pending)
+            self._rows += len(instances)
+            is_leader = not self._leader_active
+            if is_leader:
+                self._leader_active = True
+            elif self._rows >= self.max_rows:
+                self._cond.notify_all()
+
+        if is_leader:
+            self._lead()
+        else:
+            pending.event.wait()
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _lead(self):
+        with self._cond:
+            deadline = time.monotonic() + self.max_delay
+            while self._rows < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            group, rows = self._buffer, self._rows
+            self._buffer, self._rows, self._leader_active = [], 0, False
+
+        try:
+            results, fallback = self.flush([pending.instances for pending in group])
+            for pending, result in zip(group, results):
+                if isinstance(result, Exception):
+                    pending.error = result
+                else:
+                    pending.result = result
+            self.stats.record(rows, len(group), fallback)
+        except BaseException as exc:
+            for pending in group:
+                pending.error = exc
+            raise
+        finally:
+            for pending in group:
+                pending.event.set()
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_coalescer():
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = BatchCoalescer(
+                max_delay_ms=getattr(settings, "BATCH_COALESCING_MAX_DELAY_MS", 5),
+                max_rows=getattr(settings, "BATCH_COALESCING_MAX_ROWS", 500),
+            )
+        return _coalescer
+
+
+def should_coalesce(instances):
+    """
+    Solo se agrupan lotes pequeños y fuera de un bloque atómico: si el request ya
+    abrió una transacción (p. ej. con Idempotency-Key), sus filas deben
+    confirmarse en ella y no en el commit del líder.
+    """
+    return (
+        getattr(settings, "BATCH_COALESCING_ENABLED", False)
+        and len(instances) <= getattr(settings, "BATCH_COALESCING_MAX_BATCH_SIZE", 20)
+        and not transaction.get_connection().in_atomic_block
+    )
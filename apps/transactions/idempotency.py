@@ -0,0 +1,135 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyInProgress(Exception):
+    """El intento en curso con la misma llave no terminó dentro del tiempo de espera."""
+
+
+def _ttl():
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+
+def _lock_timeout_ms():
+    return getattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT_MS", 30_000)
+
+
+def request_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+def purge_expired_records():
+    """Elimina los registros de idempotencia vencidos. Devuelve la cantidad borrada."""
+    deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def summarize_response(data, status_code):
+    """
+    Resumen acotado de la respuesta que se guarda para los reintentos.
+
+    Un 201 no guarda las filas creadas, solo `created`, el rango de IDs y el sha256 de
+    la lista de IDs separados por comas; su tamaño no depende del lote. Los 4xx se
+    guardan tal cual, con sus errores.
+    """
+    if status_code != status.HTTP_201_CREATED:
+        return data
+    ids = [row["id"] for row in data["transactions"]]
+    return {
+        "created": data["created"],
+        "first_id": min(ids, default=None),
+        "last_id": max(ids, default=None),
+        "ids_sha256": hashlib.sha256(",".join(map(str, ids)).encode()).hexdigest(),
+    }
+
+
+def _claim(key, body_hash):
+    """
+    Inserta el registro de la llave dentro de la transacción en curso.
+
+    En PostgreSQL, si otro intento con la misma llave sigue abierto, el INSERT
+    espera a que ese intento confirme o revierta (hasta `IDEMPOTENCY_LOCK_TIMEOUT_MS`).
+    Devuelve None si la llave ya existe.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {int(_lock_timeout_ms())}")
+    try:
+        with transaction.atomic():
+            return IdempotencyRecord.objects.create(
+                key=key,
+                request_hash=body_hash,
+                expires_at=timezone.now() + _ttl(),
+            )
+    except IntegrityError:
+        return None
+    except OperationalError as exc:
+        raise IdempotencyKeyInProgress(key) from exc
+    finally:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL lock_timeout = DEFAULT")
+
+
+def _replay(key, body_hash):
+    record = IdempotencyRecord.objects.filter(key=key).first()
+    if record is None or record.response_status is None:
+        return Response(
+            {"error": "Hay una solicitud en curso con la misma Idempotency-Key."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if record.request_hash != body_hash:
+        return Response(
+            {"error": "La Idempotency-Key ya se usó con un payload distinto."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        record.response_body,
+        status=record.response_status,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def run_idempotent(key, body, handler):
+    """
+    Ejecuta `handler` una sola vez por llave de idempotencia.
+
+    El registro de la llave y las escrituras de `handler` se confirman en la misma
+    transacción, de modo que un reintento concurrente espera al intento en curso y
+    luego recibe el resumen almacenado (ver `summarize_response`). Las respuestas 5xx
+    no se almacenan para que el cliente pueda reintentar.
+    """
+    body_hash = request_hash(body)
+    IdempotencyRecord.objects.filter(key=key, expires_at__lte=timezone.now()).delete()
+
+    try:
+        with transaction.atomic():
+            record = _claim(key, body_hash)
+            if record is not None:
+                response = handler()
+                if response.status_code >= 500:
+                    transaction.set_rollback(True)
+                    return response
+                record.response_status = response.status_code
+                record.response_body = summarize_response(response.data, response.status_code)
+                record.save(update_fields=["response_status", "response_body"])
+                return response
+    except IdempotencyKeyInProgress:
+        return Response(
+            {"error": "Hay una solicitud en curso con la misma Idempotency-Key."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return _replay(key, body_hash)
@@ -0,0 +1,25 @@
+from django.db import transaction
+
+from .profiles import invalidate_customer_profiles
+from .review_queue import enqueue_high_risk_ids
+
+
+def after_insert(high_risk_pks, customer_ids):
+    """
+    Efectos de cualquier inserción en `sales_transactions`, sin importar el camino
+    (`TransactionBatch`, serializer o agrupador).
+
+    Se llama dentro del bloque atómico del insert: los de alto riesgo se encolan en
+    la misma transacción y los perfiles de los clientes se invalidan al confirmarla.
+    """
+    enqueue_high_risk_ids(high_risk_pks)
+    customer_ids = set(customer_ids)
+    transaction.on_commit(lambda: invalidate_customer_profiles(customer_ids))
+
+
+def after_insert_instances(instances):
+    """`after_insert` para los caminos que insertan instancias de modelo."""
+    after_insert(
+        [instance.pk for instance in instances if instance.high_risk],
+        [instance.customer_id for instance in instances],
+    )
@@ -0,0 +1,220 @@
+import http.client
+import json
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from .models import HIGH_RISK_THRESHOLD
+
+
+def _positive_size(value):
+    size = int(value)
+    if size < 1:
+        raise ValueError(f"Tamaño de lote inválido: {size}")
+    return size
+
+
+def parse_batch_sizes(spec):
+    """
+    Interpreta la distribución de tamaños de lote.
+
+    - `50`: siempre 50 filas.
+    - `1-100`: uniforme entre 1 y 100.
+    - `1:0.7,50:0.2,500:0.1`: tamaños con pesos.
+
+    Lanza ValueError si algún tamaño es menor que 1, si el rango está invertido o si
+    los pesos son negativos o ninguno es positivo.
+    """
+    spec = spec.strip()
+    if ":" in spec:
+        sizes, weights = [], []
+        for item in spec.split(","):
+            size, weight = item.split(":")
+            sizes.append(_positive_size(size))
+            weight = float(weight)
+            if not math.isfinite(weight) or weight < 0:
+                raise ValueError(f"Peso inválido: {weight}")
+            weights.append(weight)
+        if not any(weights):
+            raise ValueError("Al menos un peso debe ser positivo.")
+        return lambda rng: rng.choices(sizes, weights)[0]
+    if "-" in spec:
+        low, high = (_positive_size(v) for v in spec.split("-"))
+        if low > high:
+            raise ValueError(f"Rango invertido: {low}-{high}")
+        return lambda rng: rng.randint(low, high)
+    size = _positive_size(spec)
+    return lambda rng: size
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class BatchGenerator:
+    """Genera payloads de lote con proporciones configurables de duplicados e inválidos."""
+
+    def __init__(self, batch_sizes, duplicate_ratio=0.0, invalid_ratio=0.0, high_risk_ratio=0.1, seed=None):
+        self.batch_sizes = batch_sizes
+        self.duplicate_ratio = duplicate_ratio
+        self.invalid_ratio = invalid_ratio
+        self.high_risk_ratio = high_risk_ratio
+        self.rng = random.Random(seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._sent = []
+
+    def _transaction(self, index):
+        if self.rng.random() < self.high_risk_ratio:
+            amount = HIGH_RISK_THRESHOLD + self.rng.uniform(1, 50_000)
+        else:
+            amount = self.rng.uniform(1, HIGH_RISK_THRESHOLD)
+        return {
+            "transaction_id": f"LT-{self.run_id}-{index:09d}",
+            "amount": f"{amount:.2f}",
+            "date": (date(2024, 1, 1) + timedelta(days=self.rng.randint(0, 365))).isoformat(),
+            "customer_id": f"LT-CUST-{self.rng.randint(1, 1000):04d}",
+        }
+
+    def next_batch(self):
+        """Devuelve `(kind, size, body, key)`; `kind` es new, duplicate o invalid."""
+        with self._lock:
+            roll = self.rng.random()
+            if self._sent and roll < self.duplicate_ratio:
+                size, body, key = self.rng.choice(self._sent)
+                return "duplicate", size, body, key
+
+            size = self.batch_sizes(self.rng)
+            transactions = [self._transaction(self._counter + i) for i in range(size)]
+            self._counter += size
+            kind = "new"
+            if self.duplicate_ratio <= roll < self.duplicate_ratio + self.invalid_ratio:
+                transactions[self.rng.randrange(size)]["amount"] = "-1.00"
+                kind = "invalid"
+
+            body = json.dumps({"transactions": transactions}).encode()
+            key = uuid.uuid4().hex
+            if kind == "new" and len(self._sent) < 1000:
+                self._sent.append((size, body, key))
+            return kind, size, body, key
+
+
+def send_batch(url, body, timeout, idempotency_key=None):
+    """Envía un lote y devuelve `(status, replayed, error)`."""
+    headers = {"Content-Type": "application/json"}
+    if idempotency_key:
+        headers["Idempotency-Key"] = idempotency_key
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status, response.headers.get("Idempotent-Replayed") == "true", None
+    except urllib.error.HTTPError as exc:
+        exc.read()
+        return exc.code, False, None
+    except (urllib.error.URLError, OSError, http.client.HTTPException) as exc:
+        reason = getattr(exc, "reason", exc)
+        return None, False, type(reason).__name__
+
+
+def run_load_test(
+    url,
+    generator,
+    concurrency=8,
+    duration=None,
+    total_requests=None,
+    rate=None,
+    timeout=30.0,
+    use_idempotency_keys=False,
+):
+    """
+    Ejecuta la carga contra `url` con `concurrency` workers hasta cumplir
+    `duration` segundos o `total_requests`. Con `rate` (requests/s) los envíos se
+    espacian uniformemente entre todos los workers.
+    """
+    if duration is None and total_requests is None:
+        raise ValueError("Debe indicar duration o total_requests.")
+
+    lock = threading.Lock()
+    issued = 0
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+    kinds = Counter()
+    rows = {"sent": 0, "created": 0}
+    start = time.monotonic()
+    deadline = start + duration if duration else None
+
+    def take_ticket():
+        nonlocal issued
+        with lock:
+            if total_requests is not None and issued >= total_requests:
+                return None
+            ticket = issued
+            issued += 1
+        if rate:
+            delay = start + ticket / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        return ticket
+
+    def worker():
+        while take_ticket() is not None:
+            kind, size, body, key = generator.next_batch()
+            sent_at = time.monotonic()
+            status_code, replayed, error = send_batch(
+                url, body, timeout, key if use_idempotency_keys else None
+            )
+            elapsed_ms = round((time.monotonic() - sent_at) * 1000, 2)
+            with lock:
+                latencies.append(elapsed_ms)
+                kinds[kind] += 1
+                rows["sent"] += size
+                if error:
+                    errors[error] += 1
+                    continue
+                statuses[str(status_code)] += 1
+                if status_code == 201 and not replayed:
+                    rows["created"] += size
+                elif status_code >= 400:
+                    errors[f"http_{status_code}"] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+    for future in futures:
+        future.result()
+
+    elapsed = time.monotonic() - start
+    latencies.sort()
+    completed = len(latencies)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": completed,
+        "requests_per_second": round(completed / elapsed, 2) if elapsed else 0.0,
+        "rows_sent": rows["sent"],
+        "rows_created": rows["created"],
+        "rows_per_second": round(rows["created"] / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "status_codes": dict(statuses),
+        "errors": dict(errors),
+        "request_kinds": dict(kinds),
+    }
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.transactions import archive
+
+
+def parse_older_than(value):
+    """Acepta una cantidad de días (`365`, `365d`) o una fecha ISO (`2024-01-01`)."""
+    days = value[:-1] if value.endswith("d") else value
+    if days.isdigit():
+        return timezone.localdate() - timedelta(days=int(days))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"--older-than inválido: {value!r}. Use días (365) o fecha (2024-01-01).")
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva en NDJSON comprimido por mes las transacciones anteriores al corte, "
+        "verifica conteos y checksums y las elimina de la tabla en lotes pequeños."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than", required=True, help="Días (365) o fecha de corte (2024-01-01).")
+        parser.add_argument("--directory", default=None, help="Directorio del archivo histórico.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Filas por lectura.")
+        parser.add_argument("--delete-batch-size", type=int, default=1000, help="Filas por DELETE.")
+        parser.add_argument("--pause-ms", type=int, default=0, help="Pausa entre DELETEs.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Escribir y verificar, luego descartar los archivos sin tocar la tabla.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = parse_older_than(options["older_than"])
+        directory = options["directory"]
+        batch_size = options["delete_batch_size"]
+        pause = options["pause_ms"] / 1000
+
+        if options["dry_run"]:
+            pending = list(archive.iter_parts(directory, archive.STATUS_VERIFIED))
+            if pending:
+                self.stdout.write(
+                    f"--dry-run: {len(pending)} partes verificadas de una ejecución previa "
+                    "quedan pendientes de purga."
+                )
+        else:
+            resumed = archive.resume_pending(directory, batch_size, pause)
+            if resumed:
+                self.stdout.write(f"Ejecución previa completada: {resumed} filas eliminadas.")
+
+        parts = archive.write_archive(cutoff, directory, options["chunk_size"])
+        if not parts:
+            self.stdout.write(f"No hay transacciones anteriores a {cutoff}.")
+            return
+
+        for part in parts:
+            try:
+                rows = archive.verify_part(part, batch_size)
+            except archive.ArchiveVerificationError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(f"{part.month}: {rows} filas archivadas y verificadas.")
+
+        if options["dry_run"]:
+            for part in parts:
+                part.remove()
+            archive.remove_empty_dirs(directory)
+            self.stdout.write("--dry-run: archivos descartados, la tabla no se modificó.")
+            return
+
+        deleted = sum(archive.purge_part(part, batch_size, pause) for part in parts)
+        self.stdout.write(self.style.SUCCESS(f"Filas eliminadas de sales_transactions: {deleted}"))
@@ -0,0 +1,116 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.transactions.batch import TransactionBatch
+from apps.transactions.serializers import BatchTransactionSerializer, SalesTransactionSerializer
+
+PATHS = ("serializer", "compact")
+
+
+def build_payload(rows):
+    """Payload con la misma forma que entrega `JSONParser` (dicts y strings)."""
+    prefix = uuid.uuid4().hex[:8]
+    transactions = [
+        {
+            "transaction_id": f"BENCH-{prefix}-{i:08d}",
+            "amount": f"{(i % 20_000) + 1}.{i % 100:02d}",
+            "date": f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            "customer_id": f"CUST-{i % 5000:05d}",
+        }
+        for i in range(rows)
+    ]
+    return json.loads(json.dumps({"transactions": transactions}))
+
+
+def run_serializer_path(payload):
+    serializer = BatchTransactionSerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    instances = serializer.save()
+    return SalesTransactionSerializer(instances, many=True).data
+
+
+def run_compact_path(payload):
+    batch = TransactionBatch.from_payload(payload)
+    if batch is None or batch.has_existing_ids():
+        raise ValueError("El payload de benchmark no es válido para el camino compacto.")
+    return batch.insert().to_representation()
+
+
+def _max_rss_mb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def measure(path, rows, trace=False):
+    """Ejecuta un camino completo (validar, insertar, serializar) y revierte la transacción."""
+    payload = build_payload(rows)
+    runner = run_serializer_path if path == "serializer" else run_compact_path
+    if trace:
+        tracemalloc.start()
+    rss_before = _max_rss_mb()
+    start = time.monotonic()
+
+    with transaction.atomic():
+        output = runner(payload)
+        transaction.set_rollback(True)
+
+    result = {
+        "path": path,
+        "rows": rows,
+        "created": len(output),
+        "elapsed_seconds": round(time.monotonic() - start, 3),
+        "peak_rss_mb": round(_max_rss_mb(), 1),
+        "peak_rss_delta_mb": round(_max_rss_mb() - rss_before, 1),
+    }
+    if trace:
+        result["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el pico de RSS del camino serializer + modelos con el de TransactionBatch "
+        "para un lote de N filas. Cada camino corre en un proceso aparte y la inserción "
+        "se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+        parser.add_argument("--tracemalloc", action="store_true", help="Reportar también el pico de tracemalloc.")
+        parser.add_argument("--output", default=None, help="Ruta del reporte JSON.")
+        parser.add_argument("--child", choices=PATHS, default=None, help="Uso interno: medir un solo camino.")
+
+    def handle(self, *args, **options):
+        if options["child"]:
+            result = measure(options["child"], options["rows"], options["tracemalloc"])
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = []
+        for path in options["paths"]:
+            command = [sys.executable, sys.argv[0], "bench_batch_memory", "--child", path, "--rows", str(options["rows"])]
+            if options["tracemalloc"]:
+                command.append("--tracemalloc")
+            completed = subprocess.run(command, capture_output=True, text=True, check=True)
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            self.stdout.write(
+                f"{path:<10} rows={result['rows']} elapsed_s={result['elapsed_seconds']} "
+                f"peak_rss_mb={result['peak_rss_mb']} delta_mb={result['peak_rss_delta_mb']}"
+                + (f" tracemalloc_mb={result['tracemalloc_peak_mb']}" if options["tracemalloc"] else "")
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump({"rows": options["rows"], "results": results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Reporte guardado en {options['output']}"))
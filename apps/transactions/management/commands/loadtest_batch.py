@@ -0,0 +1,117 @@
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.transactions.loadtest import BatchGenerator, parse_batch_sizes, run_load_test
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _ratio(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError(value)
+    return value
+
+
+def _positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise ValueError(value)
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera carga HTTP concurrente contra POST /api/transactions/batch/ de un "
+        "servidor ya levantado y reporta rows/s, latencias p50/p95/p99 y errores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/api/transactions/batch/")
+        parser.add_argument("--concurrency", type=_positive_int, default=8)
+        parser.add_argument(
+            "--batch-size",
+            default="1-100",
+            help="Tamaño fijo (50), rango uniforme (1-100) o pesos (1:0.7,50:0.2,500:0.1).",
+        )
+        parser.add_argument("--duplicate-ratio", type=_ratio, default=0.0, help="Reenvíos de lotes ya enviados.")
+        parser.add_argument("--invalid-ratio", type=_ratio, default=0.0, help="Lotes con una fila inválida.")
+        parser.add_argument("--high-risk-ratio", type=_ratio, default=0.1)
+        parser.add_argument("--duration", type=float, default=None, help="Segundos de carga.")
+        parser.add_argument("--requests", type=int, default=None, help="Total de requests.")
+        parser.add_argument("--rate", type=float, default=None, help="Requests/s objetivo (sin límite por defecto).")
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--idempotency-keys", action="store_true", help="Enviar Idempotency-Key por lote.")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--label", default=None, help="Etiqueta del build para comparar resultados.")
+        parser.add_argument("--output", default=None, help="Ruta del reporte JSON.")
+
+    def handle(self, *args, **options):
+        if options["duration"] is None and options["requests"] is None:
+            options["duration"] = 10.0
+        if options["duplicate_ratio"] + options["invalid_ratio"] > 1:
+            raise CommandError("--duplicate-ratio + --invalid-ratio no puede superar 1.")
+        try:
+            batch_sizes = parse_batch_sizes(options["batch_size"])
+        except ValueError:
+            raise CommandError(f"--batch-size inválido: {options['batch_size']!r}")
+
+        generator = BatchGenerator(
+            batch_sizes,
+            duplicate_ratio=options["duplicate_ratio"],
+            invalid_ratio=options["invalid_ratio"],
+            high_risk_ratio=options["high_risk_ratio"],
+            seed=options["seed"],
+        )
+        results = run_load_test(
+            options["url"],
+            generator,
+            concurrency=options["concurrency"],
+            duration=options["duration"],
+            total_requests=options["requests"],
+            rate=options["rate"],
+            timeout=options["timeout"],
+            use_idempotency_keys=options["idempotency_keys"],
+        )
+
+        latency = results["latency_ms"]
+        self.stdout.write(
+            f"requests={results['requests']} req/s={results['requests_per_second']} "
+            f"rows/s={results['rows_per_second']}"
+        )
+        self.stdout.write(
+            f"latency_ms p50={latency['p50']} p95={latency['p95']} p99={latency['p99']} max={latency['max']}"
+        )
+        self.stdout.write(f"status_codes={results['status_codes']} errors={results['errors']}")
+
+        if options["output"]:
+            config = {
+                key: options[key]
+                for key in (
+                    "url", "concurrency", "batch_size", "duplicate_ratio", "invalid_ratio",
+                    "high_risk_ratio", "duration", "requests", "rate", "idempotency_keys", "seed",
+                )
+            }
+            report = {
+                "label": options["label"],
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "started_at": timezone.now().isoformat(),
+                "config": config,
+                "results": results,
+            }
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Reporte guardado en {options['output']}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.transactions.idempotency import purge_expired_records
+
+
+class Command(BaseCommand):
+    help = "Elimina los registros de Idempotency-Key vencidos."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_records()
+        self.stdout.write(self.style.SUCCESS(f"Registros eliminados: {deleted}"))
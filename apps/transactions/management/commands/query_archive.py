@@ -0,0 +1,34 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.transactions.archive import ArchiveReader
+
+
+class Command(BaseCommand):
+    help = "Consulta las transacciones archivadas sin restaurarlas (salida NDJSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--directory", default=None, help="Directorio del archivo histórico.")
+        parser.add_argument("--customer-id", default=None)
+        parser.add_argument("--start", type=date.fromisoformat, default=None, help="Fecha inicial inclusiva.")
+        parser.add_argument("--end", type=date.fromisoformat, default=None, help="Fecha final inclusiva.")
+        parser.add_argument("--list-months", action="store_true", help="Solo listar los meses archivados.")
+
+    def handle(self, *args, **options):
+        reader = ArchiveReader(options["directory"])
+
+        if options["list_months"]:
+            for month in reader.months():
+                self.stdout.write(month)
+            return
+
+        records = reader.query(
+            customer_id=options["customer_id"],
+            start=options["start"],
+            end=options["end"],
+        )
+        for record in records:
+            self.stdout.write(json.dumps(record, cls=DjangoJSONEncoder))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='salestransaction',
+            name='customer_id',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
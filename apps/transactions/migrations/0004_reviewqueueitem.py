@@ -0,0 +1,34 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewQueueItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('decision', models.CharField(choices=[('pending', 'Pendiente'), ('approved', 'Aprobada'), ('rejected', 'Rechazada')], default='pending', max_length=10)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reviewer', models.CharField(blank=True, default='', max_length=100)),
+                ('lease_expires_at', models.DateTimeField(null=True)),
+                ('deliveries', models.PositiveIntegerField(default=0)),
+                ('note', models.TextField(blank=True, default='')),
+                ('decided_at', models.DateTimeField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sales_transaction', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='review_item', to='transactions.salestransaction')),
+            ],
+            options={
+                'db_table': 'review_queue',
+                'indexes': [models.Index(condition=models.Q(('decision', 'pending')), fields=['available_at'], name='review_queue_claimable_idx')],
+            },
+        ),
+    ]
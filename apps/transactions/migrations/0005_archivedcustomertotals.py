@@ -0,0 +1,27 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_reviewqueueitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCustomerTotals',
+            fields=[
+                ('customer_id', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('transaction_count', models.PositiveBigIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('high_risk_count', models.PositiveBigIntegerField(default=0)),
+                ('last_transaction_date', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'archived_customer_totals',
+            },
+        ),
+    ]
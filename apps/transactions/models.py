@@ -1,4 +1,6 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 HIGH_RISK_THRESHOLD = 10_000.00
 
@@ -7,7 +9,7 @@ class SalesTransaction(models.Model):
     transaction_id = models.CharField(max_length=100, unique=True)
     amount = models.DecimalField(max_digits=14, decimal_places=2)
     date = models.DateField()
-    customer_id = models.CharField(max_length=100)
+    customer_id = models.CharField(max_length=100, db_index=True)
     high_risk = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -21,3 +23,70 @@ class SalesTransaction(models.Model):
     def save(self, *args, **kwargs):
         self.high_risk = self.amount > HIGH_RISK_THRESHOLD
         super().save(*args, **kwargs)
+
+
+class ArchivedCustomerTotals(models.Model):
+    """Totales por cliente de las filas ya archivadas y eliminadas de `sales_transactions`."""
+
+    customer_id = models.CharField(max_length=100, primary_key=True)
+    transaction_count = models.PositiveBigIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    high_risk_count = models.PositiveBigIntegerField(default=0)
+    last_transaction_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "archived_customer_totals"
+
+    def __str__(self):
+        return f"Archived {self.customer_id} | count={self.transaction_count} | ${self.total_amount}"
+
+
+class IdempotencyRecord(models.Model):
+    key = models.CharField(max_length=255, primary_key=True)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_records"
+
+    def __str__(self):
+        return f"Idempotency {self.key} | status={self.response_status}"
+
+
+class ReviewQueueItem(models.Model):
+    class Decision(models.TextChoices):
+        PENDING = "pending", "Pendiente"
+        APPROVED = "approved", "Aprobada"
+        REJECTED = "rejected", "Rechazada"
+
+    sales_transaction = models.OneToOneField(
+        SalesTransaction,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="review_item",
+    )
+    decision = models.CharField(max_length=10, choices=Decision.choices, default=Decision.PENDING)
+    available_at = models.DateTimeField(default=timezone.now)
+    reviewer = models.CharField(max_length=100, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True)
+    deliveries = models.PositiveIntegerField(default=0)
+    note = models.TextField(blank=True, default="")
+    decided_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "review_queue"
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=models.Q(decision="pending"),
+                name="review_queue_claimable_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Review {self.pk} | {self.decision} | reviewer={self.reviewer or '-'}"
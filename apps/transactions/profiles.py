@@ -0,0 +1,165 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max, Q, Sum
+
+from .models import ArchivedCustomerTotals, SalesTransaction
+
+PROFILE_CACHE_PREFIX = "customer-profile"
+GENERATION_CACHE_PREFIX = "customer-profile-gen"
+
+
+def _get_cache():
+    return caches[getattr(settings, "CUSTOMER_PROFILE_CACHE_ALIAS", "default")]
+
+
+def _cache_key(customer_id, generation=0):
+    return f"{PROFILE_CACHE_PREFIX}:{customer_id}:{generation}"
+
+
+def _generation_key(customer_id):
+    return f"{GENERATION_CACHE_PREFIX}:{customer_id}"
+
+
+def _get_generations(cache, customer_ids):
+    """Generación actual de cada cliente; 0 si nunca se invalidó."""
+    keys = {_generation_key(customer_id): customer_id for customer_id in customer_ids}
+    found = cache.get_many(keys.keys())
+    return {customer_id: found.get(key, 0) for key, customer_id in keys.items()}
+
+
+def _bump_generation(cache, customer_id):
+    key = _generation_key(customer_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+class ProfileCacheStats:
+    """Contadores de aciertos/fallos del caché de perfiles (por proceso)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def record(self, hits=0, misses=0, invalidations=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.invalidations += invalidations
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+stats = ProfileCacheStats()
+
+
+def _empty_profile(customer_id):
+    return {
+        "customer_id": customer_id,
+        "transaction_count": 0,
+        "total_amount": 0,
+        "high_risk_count": 0,
+        "high_risk_ratio": 0.0,
+        "last_transaction_date": None,
+    }
+
+
+def aggregate_by_customer(queryset):
+    """Conteo, suma, conteo de alto riesgo y última fecha por cliente de `queryset`."""
+    return (
+        queryset.order_by()
+        .values("customer_id")
+        .annotate(
+            transaction_count=Count("id"),
+            total_amount=Sum("amount"),
+            high_risk_count=Count("id", filter=Q(high_risk=True)),
+            last_transaction_date=Max("date"),
+        )
+    )
+
+
+def compute_profiles(customer_ids):
+    """
+    Calcula los perfiles de riesgo con una consulta agregada sobre `sales_transactions`
+    y otra sobre `archived_customer_totals`, que conserva la historia ya archivada.
+    """
+    profiles = {customer_id: _empty_profile(customer_id) for customer_id in customer_ids}
+    for row in aggregate_by_customer(SalesTransaction.objects.filter(customer_id__in=customer_ids)):
+        profiles[row["customer_id"]] = row
+
+    for totals in ArchivedCustomerTotals.objects.filter(customer_id__in=customer_ids):
+        profile = profiles[totals.customer_id]
+        profile["transaction_count"] += totals.transaction_count
+        profile["total_amount"] += totals.total_amount
+        profile["high_risk_count"] += totals.high_risk_count
+        profile["last_transaction_date"] = max(
+            filter(None, [profile["last_transaction_date"], totals.last_transaction_date])
+        )
+
+    for profile in profiles.values():
+        count = profile["transaction_count"]
+        profile["high_risk_ratio"] = round(profile["high_risk_count"] / count, 4) if count else 0.0
+    return profiles
+
+
+def get_customer_profiles(customer_ids):
+    """
+    Devuelve los perfiles de varios clientes, leyendo primero del caché y
+    calculando los faltantes en una única consulta agregada.
+
+    La llave de cada perfil incluye la generación del cliente leída antes de la
+    consulta. Si una invalidación llega mientras se calcula, el perfil calculado
+    queda guardado bajo la generación anterior y ya no se sirve.
+    """
+    customer_ids = list(dict.fromkeys(customer_ids))
+    cache = _get_cache()
+    generations = _get_generations(cache, customer_ids)
+    keys = {_cache_key(customer_id, generations[customer_id]): customer_id for customer_id in customer_ids}
+    cached = cache.get_many(keys.keys())
+    profiles = {keys[key]: profile for key, profile in cached.items()}
+
+    missing = [customer_id for customer_id in customer_ids if customer_id not in profiles]
+    stats.record(hits=len(profiles), misses=len(missing))
+    if missing:
+        computed = compute_profiles(missing)
+        cache.set_many(
+            {_cache_key(customer_id, generations[customer_id]): profile for customer_id, profile in computed.items()}
+        )
+        profiles.update(computed)
+
+    return [profiles[customer_id] for customer_id in customer_ids]
+
+
+def get_customer_profile(customer_id):
+    return get_customer_profiles([customer_id])[0]
+
+
+def invalidate_customer_profiles(customer_ids):
+    """Avanza la generación de los clientes indicados y elimina sus perfiles en caché."""
+    customer_ids = set(customer_ids)
+    if not customer_ids:
+        return
+    cache = _get_cache()
+    generations = _get_generations(cache, customer_ids)
+    for customer_id in customer_ids:
+        _bump_generation(cache, customer_id)
+    cache.delete_many([_cache_key(customer_id, generation) for customer_id, generation in generations.items()])
+    stats.record(invalidations=len(customer_ids))
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ReviewQueueItem
+
+
+class ReviewLeaseLost(Exception):
+    """El ítem no está reclamado por el revisor o su lease ya venció."""
+
+
+def default_lease_seconds():
+    return getattr(settings, "REVIEW_LEASE_SECONDS", 300)
+
+
+def enqueue_high_risk_ids(transaction_pks):
+    """Encola en bloque las transacciones de alto riesgo recién insertadas."""
+    items = [ReviewQueueItem(sales_transaction_id=pk) for pk in transaction_pks]
+    return ReviewQueueItem.objects.bulk_create(items)
+
+
+def claim_items(reviewer, limit, lease_seconds=None):
+    """
+    Entrega hasta `limit` ítems disponibles al revisor.
+
+    Los ítems se bloquean con `FOR UPDATE SKIP LOCKED`, de modo que revisores
+    concurrentes nunca reciben el mismo ítem ni se esperan entre sí. Un ítem cuyo
+    lease vence vuelve a estar disponible y se entrega de nuevo.
+    """
+    now = timezone.now()
+    lease_expires_at = now + timedelta(seconds=lease_seconds or default_lease_seconds())
+
+    with transaction.atomic():
+        ids = list(
+            ReviewQueueItem.objects.select_for_update(skip_locked=True)
+            .filter(decision=ReviewQueueItem.Decision.PENDING, available_at__lte=now)
+            .order_by("available_at")
+            .values_list("id", flat=True)[:limit]
+        )
+        ReviewQueueItem.objects.filter(id__in=ids).update(
+            reviewer=reviewer,
+            lease_expires_at=lease_expires_at,
+            available_at=lease_expires_at,
+            deliveries=F("deliveries") + 1,
+        )
+
+    return list(ReviewQueueItem.objects.filter(id__in=ids).select_related("sales_transaction").order_by("id"))
+
+
+def decide_item(item, reviewer, decision, note=""):
+    """Registra la decisión si el revisor conserva un lease vigente sobre el ítem."""
+    now = timezone.now()
+    updated = ReviewQueueItem.objects.filter(
+        pk=item.pk,
+        decision=ReviewQueueItem.Decision.PENDING,
+        reviewer=reviewer,
+        lease_expires_at__gt=now,
+    ).update(decision=decision, note=note, decided_at=now, lease_expires_at=None)
+    if not updated:
+        raise ReviewLeaseLost(item.pk)
+    return ReviewQueueItem.objects.select_related("sales_transaction").get(pk=item.pk)
@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import SalesTransaction, HIGH_RISK_THRESHOLD
+from .models import SalesTransaction, ReviewQueueItem, HIGH_RISK_THRESHOLD
+from .coalescing import get_coalescer, should_coalesce
+from .ingest import after_insert_instances
 
 
 class SalesTransactionSerializer(serializers.ModelSerializer):
@@ -53,4 +56,54 @@ class BatchTransactionSerializer(serializers.Serializer):
             item["high_risk"] = item["amount"] > HIGH_RISK_THRESHOLD
             instance = SalesTransaction(**item)
             instances.append(instance)
-        return SalesTransaction.objects.bulk_create(instances)
+        if should_coalesce(instances):
+            return get_coalescer().submit(instances)
+        with transaction.atomic():
+            created = SalesTransaction.objects.bulk_create(instances)
+            after_insert_instances(created)
+        return created
+
+
+class CustomerProfileSerializer(serializers.Serializer):
+    customer_id = serializers.CharField()
+    transaction_count = serializers.IntegerField()
+    total_amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+    high_risk_count = serializers.IntegerField()
+    high_risk_ratio = serializers.FloatField()
+    last_transaction_date = serializers.DateField(allow_null=True)
+
+
+class ReviewQueueItemSerializer(serializers.ModelSerializer):
+    sales_transaction = SalesTransactionSerializer(read_only=True)
+
+    class Meta:
+        model = ReviewQueueItem
+        fields = [
+            "id",
+            "sales_transaction",
+            "decision",
+            "reviewer",
+            "lease_expires_at",
+            "deliveries",
+            "note",
+            "decided_at",
+        ]
+        read_only_fields = fields
+
+
+class ReviewerSerializer(serializers.Serializer):
+    """`CharField` ya recorta espacios y rechaza el revisor vacío."""
+
+    reviewer = serializers.CharField(max_length=100)
+
+
+class ReviewClaimSerializer(ReviewerSerializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    lease_seconds = serializers.IntegerField(min_value=30, max_value=3600, required=False)
+
+
+class ReviewDecisionSerializer(ReviewerSerializer):
+    decision = serializers.ChoiceField(
+        choices=[ReviewQueueItem.Decision.APPROVED, ReviewQueueItem.Decision.REJECTED]
+    )
+    note = serializers.CharField(required=False, allow_blank=True, default="")
@@ -0,0 +1,165 @@
+import gzip
+import pytest
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.transactions import archive, profiles
+from apps.transactions.models import ArchivedCustomerTotals, ReviewQueueItem, SalesTransaction
+from .factories import SalesTransactionFactory
+
+
+def run_archive(directory, *args):
+    out = StringIO()
+    call_command("archive_transactions", "--directory", str(directory), *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def history():
+    SalesTransactionFactory(transaction_id="OLD-1", date=date(2023, 1, 5), customer_id="C1", amount=Decimal("10.00"))
+    SalesTransactionFactory(transaction_id="OLD-2", date=date(2023, 1, 20), customer_id="C2", amount=Decimal("20000.00"))
+    SalesTransactionFactory(transaction_id="OLD-3", date=date(2023, 2, 3), customer_id="C1", amount=Decimal("30.00"))
+    SalesTransactionFactory(transaction_id="NEW-1", date=date(2024, 6, 1), customer_id="C1", amount=Decimal("40.00"))
+
+
+@pytest.mark.django_db
+class TestArchiveTransactionsCommand:
+    def test_archives_and_deletes_rows_before_cutoff(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "2024-01-01", "--delete-batch-size", "1")
+
+        remaining = list(SalesTransaction.objects.values_list("transaction_id", flat=True))
+        assert remaining == ["NEW-1"]
+
+    def test_partitions_by_month_with_manifest(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "2024-01-01")
+
+        parts = list(archive.iter_parts(tmp_path))
+        assert [p.month for p in parts] == ["2023-01", "2023-02"]
+        manifest = parts[0].read_manifest()
+        assert manifest["row_count"] == 2
+        assert manifest["status"] == archive.STATUS_PURGED
+
+    def test_dry_run_keeps_table_and_discards_files(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "2024-01-01", "--dry-run")
+
+        assert SalesTransaction.objects.count() == 4
+        assert list(archive.iter_parts(tmp_path)) == []
+
+    def test_dry_run_does_not_resume_verified_parts(self, tmp_path, history):
+        part = archive.write_archive(date(2024, 1, 1), tmp_path)[0]
+        archive.verify_part(part)
+
+        output = run_archive(tmp_path, "--older-than", "2024-01-01", "--dry-run")
+
+        assert SalesTransaction.objects.count() == 4
+        assert part.read_manifest()["status"] == archive.STATUS_VERIFIED
+        assert "pendientes de purga" in output
+
+    def test_nothing_to_archive(self, tmp_path, history):
+        output = run_archive(tmp_path, "--older-than", "2000-01-01")
+        assert "No hay transacciones" in output
+
+    def test_invalid_older_than_raises_error(self, tmp_path):
+        with pytest.raises(CommandError):
+            run_archive(tmp_path, "--older-than", "ayer")
+
+    def test_older_than_accepts_days(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "36500d")
+        assert SalesTransaction.objects.count() == 4
+
+
+@pytest.mark.django_db
+class TestArchiveWithReviewQueue:
+    def test_keeps_pending_reviews_and_decision_history(self, tmp_path, history):
+        old_1 = SalesTransaction.objects.get(transaction_id="OLD-1")
+        old_2 = SalesTransaction.objects.get(transaction_id="OLD-2")
+        ReviewQueueItem.objects.create(sales_transaction=old_1, decision=ReviewQueueItem.Decision.APPROVED)
+        ReviewQueueItem.objects.create(sales_transaction=old_2)
+
+        output = run_archive(tmp_path, "--older-than", "2024-01-01")
+
+        remaining = set(SalesTransaction.objects.values_list("transaction_id", flat=True))
+        assert remaining == {"OLD-2", "NEW-1"}
+        assert "Filas eliminadas de sales_transactions: 2" in output
+        decided = ReviewQueueItem.objects.get(sales_transaction_id=old_1.pk)
+        assert decided.decision == ReviewQueueItem.Decision.APPROVED
+        assert ReviewQueueItem.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestArchiveKeepsProfiles:
+    def test_profiles_include_archived_history(self, tmp_path, history):
+        before = profiles.compute_profiles(["C1", "C2"])
+
+        run_archive(tmp_path, "--older-than", "2024-01-01")
+
+        assert SalesTransaction.objects.filter(customer_id__in=["C1", "C2"]).count() == 1
+        assert profiles.compute_profiles(["C1", "C2"]) == before
+        assert before["C2"]["high_risk_ratio"] == 1.0
+
+    def test_repeated_purge_does_not_double_count(self, tmp_path, history):
+        part = archive.write_archive(date(2024, 1, 1), tmp_path)[0]
+        archive.verify_part(part)
+        archive.purge_part(part)
+        archive.purge_part(part)
+
+        totals = ArchivedCustomerTotals.objects.get(customer_id="C1")
+        assert totals.transaction_count == 1
+        assert totals.total_amount == Decimal("10.00")
+        assert totals.last_transaction_date == date(2023, 1, 5)
+
+
+@pytest.mark.django_db
+class TestArchiveVerification:
+    def test_tampered_file_fails_verification(self, tmp_path, history):
+        part = archive.write_archive(date(2024, 1, 1), tmp_path)[0]
+        with gzip.open(part.data_path, "ab") as fh:
+            fh.write(b'{"id": 999}\n')
+
+        with pytest.raises(archive.ArchiveVerificationError):
+            archive.verify_part(part)
+
+    def test_modified_row_fails_verification(self, tmp_path, history):
+        part = archive.write_archive(date(2024, 1, 1), tmp_path)[0]
+        SalesTransaction.objects.filter(transaction_id="OLD-1").update(amount=Decimal("11.00"))
+
+        with pytest.raises(archive.ArchiveVerificationError):
+            archive.verify_part(part)
+
+    def test_resume_finishes_verified_parts_and_drops_unverified(self, tmp_path, history):
+        verified, written = archive.write_archive(date(2024, 1, 1), tmp_path)
+        archive.verify_part(verified)
+
+        purged = archive.resume_pending(tmp_path)
+
+        assert purged == 2
+        assert verified.read_manifest()["status"] == archive.STATUS_PURGED
+        assert not written.data_path.exists()
+        assert SalesTransaction.objects.filter(transaction_id="OLD-3").exists()
+
+
+@pytest.mark.django_db
+class TestArchiveReader:
+    def test_reads_archived_months_lazily(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "2024-01-01")
+        reader = archive.ArchiveReader(tmp_path)
+
+        assert reader.months() == ["2023-01", "2023-02"]
+        records = list(reader.iter_month("2023-01"))
+        assert [r["transaction_id"] for r in records] == ["OLD-1", "OLD-2"]
+        assert records[1]["amount"] == Decimal("20000.00")
+        assert records[1]["high_risk"] is True
+
+    def test_query_filters_by_customer_and_dates(self, tmp_path, history):
+        run_archive(tmp_path, "--older-than", "2024-01-01")
+        reader = archive.ArchiveReader(tmp_path)
+
+        records = list(reader.query(customer_id="C1", start=date(2023, 1, 10)))
+
+        assert [r["transaction_id"] for r in records] == ["OLD-3"]
+
+    def test_unpurged_parts_are_not_visible(self, tmp_path, history):
+        archive.write_archive(date(2024, 1, 1), tmp_path)
+        assert archive.ArchiveReader(tmp_path).months() == []
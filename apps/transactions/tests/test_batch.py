@@ -0,0 +1,181 @@
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.transactions import profiles
+from apps.transactions.batch import TransactionBatch
+from apps.transactions.coalescing import insert_batches
+from apps.transactions.models import HIGH_RISK_THRESHOLD, ReviewQueueItem, SalesTransaction
+from apps.transactions.serializers import BatchTransactionSerializer, SalesTransactionSerializer
+from .factories import SalesTransactionFactory
+
+
+BATCH_URL = "/api/transactions/batch/"
+
+ROW = {
+    "transaction_id": "TXN-CB-001",
+    "amount": "250.00",
+    "date": "2024-03-10",
+    "customer_id": "CUST-CB",
+}
+
+
+def payload(*rows):
+    return {"transactions": list(rows)}
+
+
+class TestTransactionBatchFromPayload:
+    def test_builds_columns(self):
+        batch = TransactionBatch.from_payload(
+            payload(ROW, {**ROW, "transaction_id": " TXN-CB-002 ", "amount": "10000.01"})
+        )
+
+        assert len(batch) == 2
+        assert batch.transaction_ids == ["TXN-CB-001", "TXN-CB-002"]
+        assert list(batch.amount_cents) == [25_000, 1_000_001]
+        assert list(batch.high_risk) == [0, 1]
+
+    def test_threshold_is_not_high_risk(self):
+        batch = TransactionBatch.from_payload(payload({**ROW, "amount": "10000.00"}))
+        assert list(batch.high_risk) == [0]
+
+    def test_customer_ids_are_interned(self):
+        batch = TransactionBatch.from_payload(
+            payload(ROW, {**ROW, "transaction_id": "TXN-CB-002", "customer_id": "".join(["CUST-", "CB"])})
+        )
+        assert batch.customer_ids[0] is batch.customer_ids[1]
+
+    @pytest.mark.parametrize(
+        "override",
+        [
+            {"amount": "-5.00"},
+            {"amount": "0"},
+            {"amount": "1.005"},
+            {"amount": 12.5},
+            {"amount": True},
+            {"date": "10/03/2024"},
+            {"date": "2024-02-30"},
+            {"transaction_id": "   "},
+            {"customer_id": 123},
+            {"customer_id": "x" * 101},
+        ],
+    )
+    def test_defers_to_serializer_for_anything_unusual(self, override):
+        assert TransactionBatch.from_payload(payload({**ROW, **override})) is None
+
+    def test_defers_missing_fields_duplicates_and_empty_batches(self):
+        row = {**ROW}
+        del row["date"]
+        assert TransactionBatch.from_payload(payload(row)) is None
+        assert TransactionBatch.from_payload(payload(ROW, ROW)) is None
+        assert TransactionBatch.from_payload(payload()) is None
+        assert TransactionBatch.from_payload({}) is None
+
+
+@pytest.mark.django_db
+class TestTransactionBatchInsert:
+    def test_inserts_rows_and_enqueues_high_risk(self):
+        batch = TransactionBatch.from_payload(
+            payload(ROW, {**ROW, "transaction_id": "TXN-CB-002", "amount": "15000.00"})
+        ).insert()
+
+        assert len(batch.pks) == 2
+        risky = SalesTransaction.objects.get(transaction_id="TXN-CB-002")
+        assert risky.amount == Decimal("15000.00")
+        assert risky.high_risk is True
+        assert list(ReviewQueueItem.objects.values_list("sales_transaction_id", flat=True)) == [risky.pk]
+
+    def test_representation_matches_serializer_output(self):
+        batch = TransactionBatch.from_payload(payload(ROW)).insert()
+
+        expected = SalesTransactionSerializer(SalesTransaction.objects.all(), many=True).data
+
+        assert batch.to_representation() == [dict(row) for row in expected]
+
+    def test_detects_existing_ids(self):
+        SalesTransactionFactory(transaction_id="TXN-CB-001")
+        assert TransactionBatch.from_payload(payload(ROW)).has_existing_ids() is True
+
+    def test_matches_serializer_path_persisted_values(self):
+        rows = [
+            {**ROW, "transaction_id": f"TXN-CB-{i}", "amount": amount}
+            for i, amount in enumerate(["1", "9.9", "10000.01"])
+        ]
+        TransactionBatch.from_payload(payload(*rows)).insert()
+        compact = list(SalesTransaction.objects.order_by("id").values_list("amount", "date", "high_risk"))
+        SalesTransaction.objects.all().delete()
+
+        serializer = BatchTransactionSerializer(data=payload(*rows))
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        legacy = list(SalesTransaction.objects.order_by("id").values_list("amount", "date", "high_risk"))
+
+        assert compact == legacy
+
+
+@pytest.mark.django_db
+class TestBatchViewPaths:
+    def test_existing_id_falls_back_to_serializer_errors(self):
+        SalesTransactionFactory(transaction_id="TXN-CB-001")
+
+        response = APIClient().post(BATCH_URL, payload(ROW), format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "transactions" in response.data["errors"]
+
+    def test_validation_uses_a_single_lookup_query(self, django_assert_max_num_queries):
+        rows = [{**ROW, "transaction_id": f"TXN-CB-{i:03d}"} for i in range(50)]
+        with django_assert_max_num_queries(4):
+            response = APIClient().post(BATCH_URL, payload(*rows), format="json")
+        assert response.data["created"] == 50
+
+
+def insert_compact(rows):
+    TransactionBatch.from_payload(payload(*rows)).insert()
+
+
+def insert_serializer(rows):
+    serializer = BatchTransactionSerializer(data=payload(*rows))
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def insert_coalesced(rows):
+    serializer = BatchTransactionSerializer(data=payload(*rows))
+    serializer.is_valid(raise_exception=True)
+    rows = serializer.validated_data["transactions"]
+    insert_batches([[SalesTransaction(**row, high_risk=row["amount"] > HIGH_RISK_THRESHOLD) for row in rows]])
+
+
+@pytest.mark.django_db
+class TestAfterInsertEffects:
+    @pytest.fixture(autouse=True)
+    def clean_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.mark.parametrize("insert", [insert_compact, insert_serializer, insert_coalesced])
+    def test_every_path_enqueues_and_invalidates(self, insert, django_capture_on_commit_callbacks):
+        assert profiles.get_customer_profile("CUST-CB")["transaction_count"] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            insert([ROW, {**ROW, "transaction_id": "TXN-CB-002", "amount": "15000.00"}])
+
+        risky = SalesTransaction.objects.get(transaction_id="TXN-CB-002")
+        assert list(ReviewQueueItem.objects.values_list("sales_transaction_id", flat=True)) == [risky.pk]
+        assert profiles.get_customer_profile("CUST-CB")["transaction_count"] == 2
+
+
+@pytest.mark.django_db
+class TestBenchBatchMemoryCommand:
+    @pytest.mark.parametrize("path", ["serializer", "compact"])
+    def test_child_measures_and_rolls_back(self, path):
+        out = StringIO()
+        call_command("bench_batch_memory", "--child", path, "--rows", "20", stdout=out)
+
+        assert '"created": 20' in out.getvalue()
+        assert SalesTransaction.objects.count() == 0
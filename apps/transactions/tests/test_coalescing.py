@@ -0,0 +1,191 @@
+import threading
+import time
+import pytest
+from decimal import Decimal
+from django.db import IntegrityError
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.transactions import coalescing
+from apps.transactions.coalescing import BatchCoalescer, CommitSizeStats, insert_batches
+from apps.transactions.models import ReviewQueueItem, SalesTransaction
+from .factories import SalesTransactionFactory
+
+
+BATCH_URL = "/api/transactions/batch/"
+STATS_URL = "/api/transactions/batch/coalescing/stats/"
+
+
+def build(transaction_id, amount="100.00"):
+    return SalesTransaction(
+        transaction_id=transaction_id,
+        amount=Decimal(amount),
+        date="2024-01-01",
+        customer_id="CUST-CO",
+        high_risk=Decimal(amount) > 10_000,
+    )
+
+
+@pytest.fixture
+def fresh_coalescer(monkeypatch):
+    monkeypatch.setattr(coalescing, "_coalescer", None)
+
+
+class TestCommitSizeStats:
+    def test_histogram_buckets_rows_per_commit(self):
+        stats = CommitSizeStats()
+        stats.record(1, 1)
+        stats.record(7, 3)
+        stats.record(5000, 10, fallback=True)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["commits"] == 3
+        assert snapshot["fallbacks"] == 1
+        assert snapshot["rows_per_commit"]["<=1"] == 1
+        assert snapshot["rows_per_commit"]["<=10"] == 1
+        assert snapshot["rows_per_commit"][">1000"] == 1
+        assert snapshot["avg_requests_per_commit"] == 4.67
+
+
+class TestBatchCoalescer:
+    def submit_concurrently(self, coalescer, batches):
+        results = [None] * len(batches)
+        barrier = threading.Barrier(len(batches))
+
+        def run(i):
+            barrier.wait()
+            try:
+                results[i] = coalescer.submit(batches[i])
+            except Exception as exc:
+                results[i] = exc
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(batches))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_submissions_share_a_flush(self):
+        flushed = []
+
+        def flush(batches):
+            flushed.append(batches)
+            return [[f"ok-{item}" for item in batch] for batch in batches], False
+
+        coalescer = BatchCoalescer(flush, max_delay_ms=200, max_rows=1000)
+        batches = [[f"{i}-a", f"{i}-b"] for i in range(8)]
+
+        results = self.submit_concurrently(coalescer, batches)
+
+        assert results == [[f"ok-{item}" for item in batch] for batch in batches]
+        assert len(flushed) < len(batches)
+        assert coalescer.stats.snapshot()["rows"] == 16
+
+    def test_failures_are_isolated_per_request(self):
+        def flush(batches):
+            return [ValueError("bad") if "bad" in batch else batch for batch in batches], True
+
+        coalescer = BatchCoalescer(flush, max_delay_ms=200, max_rows=1000)
+
+        results = self.submit_concurrently(coalescer, [["good"], ["bad"], ["good-2"]])
+
+        assert results[0] == ["good"]
+        assert isinstance(results[1], ValueError)
+        assert results[2] == ["good-2"]
+
+    def test_flush_triggers_early_when_max_rows_reached(self):
+        flushed = threading.Event()
+        groups = []
+
+        def flush(batches):
+            groups.append(batches)
+            flushed.set()
+            return batches, False
+
+        coalescer = BatchCoalescer(flush, max_delay_ms=10_000, max_rows=6)
+        batches = [[f"{i}-a", f"{i}-b"] for i in range(3)]
+        results = {}
+        threads = [
+            threading.Thread(target=lambda i=i: results.__setitem__(i, coalescer.submit(batches[i])))
+            for i in range(3)
+        ]
+
+        for thread in threads[:2]:
+            thread.start()
+            time.sleep(0.05)
+        assert not flushed.is_set()
+
+        start = time.monotonic()
+        threads[2].start()
+        assert flushed.wait(timeout=2)
+        elapsed = time.monotonic() - start
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert elapsed < 1
+        assert groups == [batches]
+        assert [results[i] for i in range(3)] == batches
+
+    def test_unexpected_flush_error_reaches_every_request(self):
+        def flush(batches):
+            raise RuntimeError("db down")
+
+        coalescer = BatchCoalescer(flush, max_delay_ms=200, max_rows=1000)
+
+        results = self.submit_concurrently(coalescer, [["a"], ["b"]])
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.django_db
+class TestInsertBatches:
+    def test_inserts_all_batches_in_one_commit(self):
+        results, fallback = insert_batches([[build("CO-1")], [build("CO-2"), build("CO-3", "20000.00")]])
+
+        assert fallback is False
+        assert [len(r) for r in results] == [1, 2]
+        assert SalesTransaction.objects.count() == 3
+        assert ReviewQueueItem.objects.count() == 1
+
+    def test_conflicting_batch_fails_alone(self):
+        SalesTransactionFactory(transaction_id="CO-EXISTS")
+
+        results, fallback = insert_batches([[build("CO-4")], [build("CO-EXISTS")], [build("CO-5")]])
+
+        assert fallback is True
+        assert isinstance(results[1], IntegrityError)
+        assert SalesTransaction.objects.filter(transaction_id__in=["CO-4", "CO-5"]).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCoalescedBatchView:
+    def test_small_batches_go_through_coalescer(self, settings, fresh_coalescer):
+        settings.BATCH_COALESCING_ENABLED = True
+        settings.BATCH_COALESCING_MAX_DELAY_MS = 1
+        payload = {
+            "transactions": [
+                {"transaction_id": "CO-VIEW-1", "amount": "100.00", "date": "2024-01-01", "customer_id": "C1"}
+            ]
+        }
+        client = APIClient()
+
+        response = client.post(BATCH_URL, payload, format="json")
+        stats = client.get(STATS_URL)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["transactions"][0]["id"] is not None
+        assert stats.data["enabled"] is True
+        assert stats.data["commits"] == 1
+
+    def test_disabled_by_default(self, fresh_coalescer):
+        payload = {
+            "transactions": [
+                {"transaction_id": "CO-VIEW-2", "amount": "100.00", "date": "2024-01-01", "customer_id": "C1"}
+            ]
+        }
+        client = APIClient()
+
+        client.post(BATCH_URL, payload, format="json")
+
+        assert client.get(STATS_URL).data["commits"] == 0
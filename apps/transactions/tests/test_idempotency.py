@@ -0,0 +1,116 @@
+import hashlib
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.transactions.idempotency import purge_expired_records
+from apps.transactions.models import IdempotencyRecord, SalesTransaction
+
+
+BATCH_URL = "/api/transactions/batch/"
+
+PAYLOAD = {
+    "transactions": [
+        {
+            "transaction_id": "TXN-IDEM-001",
+            "amount": "250.00",
+            "date": "2024-03-10",
+            "customer_id": "CUST-I01",
+        },
+    ]
+}
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def post(client, payload, key):
+    return client.post(BATCH_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+
+@pytest.mark.django_db
+class TestIdempotencyKey:
+    def test_first_request_stores_response(self, api_client):
+        response = post(api_client, PAYLOAD, "key-1")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        record = IdempotencyRecord.objects.get(key="key-1")
+        assert record.response_status == 201
+        assert record.response_body["created"] == 1
+        assert "transactions" not in record.response_body
+
+    def test_retry_replays_stored_response_without_inserting(self, api_client):
+        first = post(api_client, PAYLOAD, "key-2")
+
+        with patch("apps.transactions.views.BatchTransactionSerializer") as serializer:
+            retry = post(api_client, PAYLOAD, "key-2")
+            serializer.assert_not_called()
+
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry["Idempotent-Replayed"] == "true"
+        created_id = first.json()["transactions"][0]["id"]
+        assert retry.json() == {
+            "created": 1,
+            "first_id": created_id,
+            "last_id": created_id,
+            "ids_sha256": hashlib.sha256(str(created_id).encode()).hexdigest(),
+        }
+        assert SalesTransaction.objects.filter(transaction_id="TXN-IDEM-001").count() == 1
+
+    def test_same_key_with_different_payload_returns_422(self, api_client):
+        post(api_client, PAYLOAD, "key-3")
+        other = {"transactions": [{**PAYLOAD["transactions"][0], "amount": "999.00"}]}
+
+        response = post(api_client, other, "key-3")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_validation_errors_are_replayed(self, api_client):
+        post(api_client, {"transactions": []}, "key-4")
+        retry = post(api_client, {"transactions": []}, "key-4")
+
+        assert retry.status_code == status.HTTP_400_BAD_REQUEST
+        assert retry["Idempotent-Replayed"] == "true"
+        assert "transactions" in retry.json()["errors"]
+
+    def test_server_errors_are_not_stored(self, api_client):
+        with patch(
+            "apps.transactions.batch.TransactionBatch.insert",
+            side_effect=Exception("db down"),
+        ):
+            response = post(api_client, PAYLOAD, "key-5")
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert not IdempotencyRecord.objects.filter(key="key-5").exists()
+
+        retry = post(api_client, PAYLOAD, "key-5")
+        assert retry.status_code == status.HTTP_201_CREATED
+
+    def test_expired_key_is_processed_again(self, api_client):
+        post(api_client, PAYLOAD, "key-6")
+        IdempotencyRecord.objects.filter(key="key-6").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        other = {"transactions": [{**PAYLOAD["transactions"][0], "transaction_id": "TXN-IDEM-002"}]}
+
+        response = post(api_client, other, "key-6")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "Idempotent-Replayed" not in response
+
+    def test_key_too_long_returns_400(self, api_client):
+        response = post(api_client, PAYLOAD, "k" * 256)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_purge_expired_records(self, api_client):
+        post(api_client, PAYLOAD, "key-7")
+        IdempotencyRecord.objects.filter(key="key-7").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        assert purge_expired_records() == 1
+        assert not IdempotencyRecord.objects.exists()
@@ -0,0 +1,183 @@
+import json
+import random
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.transactions.loadtest import (
+    BatchGenerator,
+    parse_batch_sizes,
+    percentile,
+    run_load_test,
+)
+
+
+class StubBatchHandler(BaseHTTPRequestHandler):
+    """Responde 201, o 400 si algún monto es negativo, sin tocar la base de datos."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        invalid = any(t["amount"].startswith("-") for t in body["transactions"])
+        self.send_response(400 if invalid else 201)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TruncatedResponseHandler(BaseHTTPRequestHandler):
+    """Anuncia un body más largo del que envía y cierra la conexión a mitad de respuesta."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(201)
+        self.send_header("Content-Length", "100")
+        self.end_headers()
+        self.wfile.write(b"{}")
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/api/transactions/batch/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_url():
+    yield from serve(StubBatchHandler)
+
+
+@pytest.fixture
+def truncating_url():
+    yield from serve(TruncatedResponseHandler)
+
+
+class TestBatchSizeDistribution:
+    def test_fixed_size(self):
+        assert parse_batch_sizes("50")(random.Random(0)) == 50
+
+    def test_uniform_range(self):
+        sizes = parse_batch_sizes("1-5")
+        rng = random.Random(0)
+        assert {sizes(rng) for _ in range(200)} == {1, 2, 3, 4, 5}
+
+    def test_weighted_sizes(self):
+        sizes = parse_batch_sizes("1:1,500:0")
+        assert sizes(random.Random(0)) == 1
+
+    @pytest.mark.parametrize("spec", ["abc", "0", "-5", "0-10", "10-1", "1:0,5:0", "1:-1,5:2", "0:1"])
+    def test_invalid_spec_raises_value_error(self, spec):
+        with pytest.raises(ValueError):
+            parse_batch_sizes(spec)
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+
+    def test_empty_returns_none(self):
+        assert percentile([], 50) is None
+
+
+class TestBatchGenerator:
+    def test_invalid_batches_contain_negative_amount(self):
+        generator = BatchGenerator(parse_batch_sizes("3"), invalid_ratio=1.0, seed=1)
+        kind, size, body, _ = generator.next_batch()
+        amounts = [t["amount"] for t in json.loads(body)["transactions"]]
+        assert kind == "invalid"
+        assert size == 3
+        assert "-1.00" in amounts
+
+    def test_duplicates_resend_previous_batch(self):
+        generator = BatchGenerator(parse_batch_sizes("2"), duplicate_ratio=0.5, seed=3)
+        batches = [generator.next_batch() for _ in range(20)]
+        new_bodies = {b[2] for b in batches if b[0] == "new"}
+        duplicates = [b for b in batches if b[0] == "duplicate"]
+        assert duplicates
+        assert all(d[2] in new_bodies for d in duplicates)
+
+    def test_transaction_ids_are_unique_for_new_batches(self):
+        generator = BatchGenerator(parse_batch_sizes("10"), seed=2)
+        ids = [
+            t["transaction_id"]
+            for _ in range(5)
+            for t in json.loads(generator.next_batch()[2])["transactions"]
+        ]
+        assert len(ids) == len(set(ids))
+
+
+class TestRunLoadTest:
+    def test_reports_throughput_latency_and_errors(self, stub_url):
+        generator = BatchGenerator(parse_batch_sizes("4"), invalid_ratio=0.5, seed=7)
+
+        results = run_load_test(stub_url, generator, concurrency=4, total_requests=40)
+
+        assert results["requests"] == 40
+        assert results["status_codes"]["201"] + results["status_codes"]["400"] == 40
+        assert results["errors"]["http_400"] == results["status_codes"]["400"]
+        assert results["rows_created"] == results["status_codes"]["201"] * 4
+        assert results["latency_ms"]["p50"] <= results["latency_ms"]["p99"]
+
+    def test_connection_errors_are_counted(self):
+        generator = BatchGenerator(parse_batch_sizes("1"), seed=0)
+
+        results = run_load_test(
+            "http://127.0.0.1:9/api/transactions/batch/", generator, concurrency=1, total_requests=2, timeout=1
+        )
+
+        assert results["requests"] == 2
+        assert sum(results["errors"].values()) == 2
+
+    def test_truncated_responses_are_counted(self, truncating_url):
+        generator = BatchGenerator(parse_batch_sizes("1"), seed=0)
+
+        results = run_load_test(truncating_url, generator, concurrency=2, total_requests=4)
+
+        assert results["requests"] == 4
+        assert results["errors"] == {"IncompleteRead": 4}
+
+    def test_requires_duration_or_total_requests(self, stub_url):
+        with pytest.raises(ValueError):
+            run_load_test(stub_url, BatchGenerator(parse_batch_sizes("1")))
+
+
+class TestLoadtestBatchCommand:
+    def test_writes_json_report(self, stub_url, tmp_path):
+        output = tmp_path / "report.json"
+
+        call_command(
+            "loadtest_batch",
+            "--url", stub_url,
+            "--requests", "10",
+            "--concurrency", "2",
+            "--batch-size", "1-5",
+            "--label", "baseline",
+            "--output", str(output),
+            stdout=StringIO(),
+        )
+
+        report = json.loads(output.read_text())
+        assert report["label"] == "baseline"
+        assert report["config"]["concurrency"] == 2
+        assert report["results"]["requests"] == 10
+
+    @pytest.mark.parametrize(
+        "args",
+        [["--concurrency", "0"], ["--batch-size", "0"], ["--batch-size", "10-1"], ["--batch-size", "1:0"]],
+    )
+    def test_invalid_options_raise_command_error(self, args):
+        with pytest.raises(CommandError):
+            call_command("loadtest_batch", "--url", "http://127.0.0.1:9", "--requests", "1", *args, stdout=StringIO())
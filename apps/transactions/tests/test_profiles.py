@@ -0,0 +1,160 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.transactions import profiles
+from .factories import SalesTransactionFactory
+
+
+BATCH_URL = "/api/transactions/batch/"
+BULK_URL = "/api/customers/profiles/"
+STATS_URL = "/api/customers/profiles/stats/"
+
+
+def profile_url(customer_id):
+    return f"/api/customers/{customer_id}/profile/"
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    profiles.stats.reset()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCustomerProfileView:
+    def test_returns_aggregated_profile(self, api_client):
+        SalesTransactionFactory(customer_id="CUST-P1", amount=Decimal("100.00"), date="2024-01-01")
+        SalesTransactionFactory(customer_id="CUST-P1", amount=Decimal("15000.00"), date="2024-02-01")
+
+        response = api_client.get(profile_url("CUST-P1"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["transaction_count"] == 2
+        assert response.data["total_amount"] == "15100.00"
+        assert response.data["high_risk_count"] == 1
+        assert response.data["high_risk_ratio"] == 0.5
+        assert response.data["last_transaction_date"] == "2024-02-01"
+
+    def test_unknown_customer_returns_empty_profile(self, api_client):
+        response = api_client.get(profile_url("CUST-NONE"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["transaction_count"] == 0
+        assert response.data["last_transaction_date"] is None
+
+    def test_second_request_is_served_from_cache(self, api_client, django_assert_num_queries):
+        SalesTransactionFactory(customer_id="CUST-P2", amount=Decimal("100.00"))
+        api_client.get(profile_url("CUST-P2"))
+
+        with django_assert_num_queries(0):
+            response = api_client.get(profile_url("CUST-P2"))
+
+        assert response.data["transaction_count"] == 1
+        assert profiles.stats.snapshot()["hits"] == 1
+
+    def test_batch_insert_invalidates_cached_profile(
+        self, api_client, django_capture_on_commit_callbacks
+    ):
+        SalesTransactionFactory(customer_id="CUST-P3", amount=Decimal("100.00"), date="2024-01-01")
+        assert api_client.get(profile_url("CUST-P3")).data["transaction_count"] == 1
+
+        payload = {
+            "transactions": [
+                {
+                    "transaction_id": "TXN-P3-NEW",
+                    "amount": "20000.00",
+                    "date": "2024-05-01",
+                    "customer_id": "CUST-P3",
+                }
+            ]
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(BATCH_URL, payload, format="json")
+
+        response = api_client.get(profile_url("CUST-P3"))
+        assert response.data["transaction_count"] == 2
+        assert response.data["high_risk_count"] == 1
+        assert response.data["last_transaction_date"] == "2024-05-01"
+
+    def test_invalidation_during_compute_discards_stale_profile(
+        self, api_client, django_capture_on_commit_callbacks
+    ):
+        SalesTransactionFactory(customer_id="CUST-P4", amount=Decimal("100.00"))
+        compute = profiles.compute_profiles
+
+        def compute_then_insert(customer_ids):
+            computed = compute(customer_ids)
+            with django_capture_on_commit_callbacks(execute=True):
+                api_client.post(
+                    BATCH_URL,
+                    {
+                        "transactions": [
+                            {
+                                "transaction_id": "TXN-P4-NEW",
+                                "amount": "50.00",
+                                "date": "2024-05-01",
+                                "customer_id": "CUST-P4",
+                            }
+                        ]
+                    },
+                    format="json",
+                )
+            return computed
+
+        with patch.object(profiles, "compute_profiles", side_effect=compute_then_insert):
+            stale = profiles.get_customer_profile("CUST-P4")
+
+        assert stale["transaction_count"] == 1
+        assert profiles.get_customer_profile("CUST-P4")["transaction_count"] == 2
+
+
+@pytest.mark.django_db
+class TestCustomerProfileBulkView:
+    def test_returns_profiles_in_requested_order(self, api_client):
+        SalesTransactionFactory(customer_id="CUST-B1", amount=Decimal("100.00"))
+        SalesTransactionFactory(customer_id="CUST-B2", amount=Decimal("200.00"))
+
+        response = api_client.get(BULK_URL, {"customer_ids": "CUST-B2,CUST-B1,CUST-B3"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        ids = [p["customer_id"] for p in response.data["profiles"]]
+        assert ids == ["CUST-B2", "CUST-B1", "CUST-B3"]
+
+    def test_misses_are_computed_in_one_query_per_table(self, api_client, django_assert_num_queries):
+        SalesTransactionFactory(customer_id="CUST-B4")
+        SalesTransactionFactory(customer_id="CUST-B5")
+
+        with django_assert_num_queries(2):
+            api_client.get(BULK_URL, {"customer_ids": "CUST-B4,CUST-B5"})
+
+    def test_returns_400_without_customer_ids(self, api_client):
+        response = api_client.get(BULK_URL)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_returns_400_when_too_many_customer_ids(self, api_client):
+        ids = ",".join(f"C{i}" for i in range(101))
+        response = api_client.get(BULK_URL, {"customer_ids": ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestCustomerProfileStatsView:
+    def test_reports_hit_ratio(self, api_client):
+        api_client.get(profile_url("CUST-S1"))
+        api_client.get(profile_url("CUST-S1"))
+
+        response = api_client.get(STATS_URL)
+
+        assert response.data["hits"] == 1
+        assert response.data["misses"] == 1
+        assert response.data["hit_ratio"] == 0.5
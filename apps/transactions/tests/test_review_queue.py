@@ -0,0 +1,142 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.transactions.models import ReviewQueueItem
+
+
+BATCH_URL = "/api/transactions/batch/"
+CLAIM_URL = "/api/review-queue/claim/"
+
+
+def decision_url(item_id):
+    return f"/api/review-queue/{item_id}/decision/"
+
+
+def make_batch(*amounts):
+    return {
+        "transactions": [
+            {
+                "transaction_id": f"TXN-RQ-{i:03d}",
+                "amount": amount,
+                "date": "2024-03-10",
+                "customer_id": "CUST-RQ",
+            }
+            for i, amount in enumerate(amounts)
+        ]
+    }
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def queued(api_client):
+    api_client.post(BATCH_URL, make_batch("15000.00", "100.00", "20000.00", "30000.00"), format="json")
+
+
+@pytest.mark.django_db
+class TestReviewQueueFill:
+    def test_only_high_risk_transactions_are_enqueued(self, queued):
+        items = ReviewQueueItem.objects.select_related("sales_transaction")
+        assert items.count() == 3
+        assert all(item.sales_transaction.high_risk for item in items)
+        assert all(item.decision == ReviewQueueItem.Decision.PENDING for item in items)
+
+
+@pytest.mark.django_db
+class TestReviewClaimView:
+    def test_claims_up_to_limit(self, api_client, queued):
+        response = api_client.post(CLAIM_URL, {"reviewer": "ana", "limit": 2}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["claimed"] == 2
+        item = response.data["items"][0]
+        assert item["reviewer"] == "ana"
+        assert item["deliveries"] == 1
+        assert item["sales_transaction"]["high_risk"] is True
+
+    def test_claimed_items_are_not_handed_out_twice(self, api_client, queued):
+        first = api_client.post(CLAIM_URL, {"reviewer": "ana", "limit": 2}, format="json")
+        second = api_client.post(CLAIM_URL, {"reviewer": "luis", "limit": 10}, format="json")
+
+        first_ids = {i["id"] for i in first.data["items"]}
+        second_ids = {i["id"] for i in second.data["items"]}
+        assert len(second_ids) == 1
+        assert first_ids.isdisjoint(second_ids)
+
+    def test_expired_lease_is_redelivered(self, api_client, queued):
+        api_client.post(CLAIM_URL, {"reviewer": "ana", "limit": 3}, format="json")
+        ReviewQueueItem.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+
+        response = api_client.post(CLAIM_URL, {"reviewer": "luis", "limit": 3}, format="json")
+
+        assert response.data["claimed"] == 3
+        assert all(i["deliveries"] == 2 for i in response.data["items"])
+
+    @pytest.mark.parametrize("body", [{"limit": 2}, {"reviewer": "   ", "limit": 2}])
+    def test_returns_400_without_reviewer(self, api_client, body):
+        response = api_client.post(CLAIM_URL, body, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reviewer_is_trimmed(self, api_client, queued):
+        response = api_client.post(CLAIM_URL, {"reviewer": "  ana  ", "limit": 1}, format="json")
+        assert response.data["items"][0]["reviewer"] == "ana"
+
+    def test_returns_400_for_limit_above_maximum(self, api_client):
+        response = api_client.post(CLAIM_URL, {"reviewer": "ana", "limit": 101}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestReviewDecisionView:
+    def claim_one(self, api_client, reviewer="ana"):
+        response = api_client.post(CLAIM_URL, {"reviewer": reviewer, "limit": 1}, format="json")
+        return response.data["items"][0]["id"]
+
+    def test_records_decision(self, api_client, queued):
+        item_id = self.claim_one(api_client)
+
+        response = api_client.post(
+            decision_url(item_id),
+            {"reviewer": "ana", "decision": "rejected", "note": "Monto inusual"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["decision"] == "rejected"
+        assert response.data["decided_at"] is not None
+
+    def test_decided_items_are_not_claimed_again(self, api_client, queued):
+        item_id = self.claim_one(api_client)
+        api_client.post(decision_url(item_id), {"reviewer": "ana", "decision": "approved"}, format="json")
+        ReviewQueueItem.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+
+        response = api_client.post(CLAIM_URL, {"reviewer": "luis", "limit": 10}, format="json")
+
+        assert item_id not in {i["id"] for i in response.data["items"]}
+
+    def test_returns_409_for_other_reviewer(self, api_client, queued):
+        item_id = self.claim_one(api_client)
+        response = api_client.post(decision_url(item_id), {"reviewer": "luis", "decision": "approved"}, format="json")
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_returns_409_when_lease_expired(self, api_client, queued):
+        item_id = self.claim_one(api_client)
+        ReviewQueueItem.objects.filter(pk=item_id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = api_client.post(decision_url(item_id), {"reviewer": "ana", "decision": "approved"}, format="json")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_returns_404_for_unknown_item(self, api_client):
+        response = api_client.post(decision_url(999), {"reviewer": "ana", "decision": "approved"}, format="json")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_returns_400_for_invalid_decision(self, api_client, queued):
+        item_id = self.claim_one(api_client)
+        response = api_client.post(decision_url(item_id), {"reviewer": "ana", "decision": "maybe"}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,8 +1,38 @@
 from django.urls import path
-from .views import BatchTransactionView
+from .views import (
+    BatchTransactionView,
+    CoalescingStatsView,
+    CustomerProfileBulkView,
+    CustomerProfileStatsView,
+    CustomerProfileView,
+    ReviewClaimView,
+    ReviewDecisionView,
+)
 
 app_name = "transactions"
 
 urlpatterns = [
     path("transactions/batch/", BatchTransactionView.as_view(), name="batch-transactions"),
+    path(
+        "transactions/batch/coalescing/stats/",
+        CoalescingStatsView.as_view(),
+        name="batch-coalescing-stats",
+    ),
+    path("customers/profiles/", CustomerProfileBulkView.as_view(), name="customer-profiles"),
+    path(
+        "customers/profiles/stats/",
+        CustomerProfileStatsView.as_view(),
+        name="customer-profile-stats",
+    ),
+    path(
+        "customers/<str:customer_id>/profile/",
+        CustomerProfileView.as_view(),
+        name="customer-profile",
+    ),
+    path("review-queue/claim/", ReviewClaimView.as_view(), name="review-claim"),
+    path(
+        "review-queue/<int:item_id>/decision/",
+        ReviewDecisionView.as_view(),
+        name="review-decision",
+    ),
 ]
@@ -1,9 +1,22 @@
+from django.conf import settings
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import coalescing, idempotency, profiles, review_queue
+from .batch import TransactionBatch
 from .middleware import log_response_time
-from .serializers import BatchTransactionSerializer, SalesTransactionSerializer
+from .models import ReviewQueueItem
+from .serializers import (
+    BatchTransactionSerializer,
+    CustomerProfileSerializer,
+    ReviewClaimSerializer,
+    ReviewDecisionSerializer,
+    ReviewQueueItemSerializer,
+    SalesTransactionSerializer,
+)
+
+MAX_PROFILES_PER_REQUEST = 100
 
 
 class BatchTransactionView(APIView):
@@ -12,10 +25,36 @@ class BatchTransactionView(APIView):
 
     POST /api/transactions/batch/
     Body: { "transactions": [ { transaction_id, amount, date, customer_id }, ... ] }
+
+    Con el header `Idempotency-Key`, los reintentos con la misma llave y payload
+    reciben la respuesta almacenada sin volver a validar ni insertar.
     """
 
     @log_response_time
     def post(self, request):
+        key = request.headers.get(idempotency.IDEMPOTENCY_HEADER)
+        if key is None:
+            return self.create_batch(request)
+
+        key = key.strip()
+        if not key or len(key) > idempotency.MAX_KEY_LENGTH:
+            return Response(
+                {
+                    "errors": {
+                        idempotency.IDEMPOTENCY_HEADER: [
+                            f"Debe tener entre 1 y {idempotency.MAX_KEY_LENGTH} caracteres."
+                        ]
+                    }
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return idempotency.run_idempotent(key, request.body, lambda: self.create_batch(request))
+
+    def create_batch(self, request):
+        batch = TransactionBatch.from_payload(request.data)
+        if batch is not None and batch.can_insert():
+            return self.create_compact_batch(batch)
+
         serializer = BatchTransactionSerializer(data=request.data)
 
         if not serializer.is_valid():
@@ -40,3 +79,153 @@ class BatchTransactionView(APIView):
             },
             status=status.HTTP_201_CREATED,
         )
+
+    def create_compact_batch(self, batch):
+        try:
+            batch.insert()
+        except Exception as exc:
+            return Response(
+                {"error": "Error interno al guardar las transacciones.", "detail": str(exc)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(
+            {
+                "created": len(batch),
+                "transactions": batch.to_representation(),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class CoalescingStatsView(APIView):
+    """
+    Distribución del tamaño de los commits agrupados del proceso.
+
+    GET /api/transactions/batch/coalescing/stats/
+    """
+
+    def get(self, request):
+        return Response(
+            {
+                "enabled": getattr(settings, "BATCH_COALESCING_ENABLED", False),
+                **coalescing.get_coalescer().stats.snapshot(),
+            }
+        )
+
+
+class CustomerProfileView(APIView):
+    """
+    Perfil de riesgo de un cliente, servido desde caché.
+
+    GET /api/customers/<customer_id>/profile/
+    """
+
+    @log_response_time
+    def get(self, request, customer_id):
+        profile = profiles.get_customer_profile(customer_id)
+        return Response(CustomerProfileSerializer(profile).data)
+
+
+class CustomerProfileBulkView(APIView):
+    """
+    Perfiles de riesgo de varios clientes en una sola llamada.
+
+    GET /api/customers/profiles/?customer_ids=CUST-001,CUST-002
+    """
+
+    @log_response_time
+    def get(self, request):
+        raw = request.query_params.get("customer_ids", "")
+        customer_ids = [c.strip() for c in raw.split(",") if c.strip()]
+
+        if not customer_ids:
+            return Response(
+                {"errors": {"customer_ids": ["Debe indicar al menos un ID de cliente."]}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(customer_ids) > MAX_PROFILES_PER_REQUEST:
+            return Response(
+                {
+                    "errors": {
+                        "customer_ids": [
+                            f"Máximo {MAX_PROFILES_PER_REQUEST} clientes por solicitud."
+                        ]
+                    }
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = profiles.get_customer_profiles(customer_ids)
+        return Response(
+            {
+                "count": len(results),
+                "profiles": CustomerProfileSerializer(results, many=True).data,
+            }
+        )
+
+
+class CustomerProfileStatsView(APIView):
+    """
+    Métricas del caché de perfiles (aciertos, fallos, hit ratio).
+
+    GET /api/customers/profiles/stats/
+    """
+
+    def get(self, request):
+        return Response(profiles.stats.snapshot())
+
+
+class ReviewClaimView(APIView):
+    """
+    Entrega al revisor hasta N transacciones de alto riesgo pendientes.
+
+    POST /api/review-queue/claim/
+    Body: { "reviewer": "ana", "limit": 10, "lease_seconds": 300 }
+    """
+
+    @log_response_time
+    def post(self, request):
+        serializer = ReviewClaimSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        items = review_queue.claim_items(**serializer.validated_data)
+        return Response(
+            {
+                "claimed": len(items),
+                "items": ReviewQueueItemSerializer(items, many=True).data,
+            }
+        )
+
+
+class ReviewDecisionView(APIView):
+    """
+    Registra la decisión del revisor sobre un ítem reclamado.
+
+    POST /api/review-queue/<item_id>/decision/
+    Body: { "reviewer": "ana", "decision": "approved" | "rejected", "note": "..." }
+    """
+
+    @log_response_time
+    def post(self, request, item_id):
+        serializer = ReviewDecisionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        item = ReviewQueueItem.objects.filter(pk=item_id).first()
+        if item is None:
+            return Response(
+                {"error": "El ítem de revisión no existe."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            item = review_queue.decide_item(item, **serializer.validated_data)
+        except review_queue.ReviewLeaseLost:
+            return Response(
+                {"error": "El ítem no está reclamado por este revisor o su lease venció."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(ReviewQueueItemSerializer(item).data)
@@ -45,6 +45,31 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="customer-profiles"),
+        "TIMEOUT": config("CACHE_TIMEOUT", default=300, cast=int),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10_000, cast=int),
+        },
+    }
+}
+
+IDEMPOTENCY_KEY_TTL = config("IDEMPOTENCY_KEY_TTL", default=24 * 60 * 60, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT_MS = config("IDEMPOTENCY_LOCK_TIMEOUT_MS", default=30_000, cast=int)
+
+TRANSACTIONS_ARCHIVE_DIR = config("TRANSACTIONS_ARCHIVE_DIR", default=str(BASE_DIR / "archive"))
+
+REVIEW_LEASE_SECONDS = config("REVIEW_LEASE_SECONDS", default=300, cast=int)
+
+BATCH_COALESCING_ENABLED = config("BATCH_COALESCING_ENABLED", default=False, cast=bool)
+BATCH_COALESCING_MAX_DELAY_MS = config("BATCH_COALESCING_MAX_DELAY_MS", default=5, cast=int)
+BATCH_COALESCING_MAX_ROWS = config("BATCH_COALESCING_MAX_ROWS", default=500, cast=int)
+BATCH_COALESCING_MAX_BATCH_SIZE = config("BATCH_COALESCING_MAX_BATCH_SIZE", default=20, cast=int)
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {